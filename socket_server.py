@@ -4,110 +4,271 @@ Socket server module for OBS Splits auto-splitting integration.
 Provides bi-directional Unix socket communication for external auto-splitting scripts.
 """
 
-import socket
+import asyncio
 import json
+import logging
 import threading
 import os
-import time
-from typing import Callable, Dict, Any, Optional
+import struct
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, Optional, Set, Union
+
+_logger = logging.getLogger(__name__)
+
+# Prefer msgspec, then orjson: both parse straight from bytes and encode
+# straight to bytes, skipping the intermediate str on both paths. msgspec
+# also checks that the command is a JSON object while decoding.
+try:
+    import msgspec
+
+    _json_loads = msgspec.json.Decoder(Dict[str, Any]).decode
+    _json_encode_into = msgspec.json.Encoder().encode_into
+    _JSONDecodeError = msgspec.DecodeError
+    _CommandTypeError = msgspec.ValidationError
+except ImportError:
+    class _CommandTypeError(Exception):
+        """Never raised; the command type is checked after decoding."""
+    try:
+        import orjson
+
+        _json_loads = orjson.loads
+        _json_dumps = orjson.dumps
+        _JSONDecodeError = orjson.JSONDecodeError
+    except ImportError:
+        # Also covers the UnicodeDecodeError from invalid UTF-8
+        _JSONDecodeError = ValueError
+
+        def _json_loads(data: Union[bytes, memoryview]) -> Any:
+            return json.loads(str(data, 'utf-8'))
+
+        def _json_dumps(obj: Any) -> bytes:
+            return json.dumps(obj).encode('utf-8')
+
+    def _json_encode_into(obj: Any, buf: bytearray, offset: int = 0) -> None:
+        buf[offset:] = _json_dumps(obj)
+
+# Optional message framing: a 4-byte little-endian payload length.
+_HEADER = struct.Struct('<I')
+_MAX_FRAME_SIZE = 1 << 20
+_RESPONSE_BUFFER_SIZE = 256
+
+# Pending connections; asyncio accepts up to this many per loop wakeup, so
+# several splitters connecting at once are drained together.
+_ACCEPT_BACKLOG = 16
+
+# Fixed error replies, serialized once
+_ERR_INVALID_COMMAND = b'{"response":"error","error":"invalid_command"}'
+_ERR_INVALID_JSON = b'{"response":"error","error":"invalid_json"}'
+_ERR_FRAME_TOO_LARGE = b'{"response":"error","error":"frame_too_large"}'
 
 
 class SplitSocketServer:
     """Unix socket server for auto-splitting integration."""
 
+    __slots__ = ('socket_path', 'abstract', 'address', 'server', 'loop',
+                 'running', 'thread', 'pool', 'clients', 'command_handler')
+
     def __init__(self, socket_path: str = "/tmp/obs_splits.sock"):
         self.socket_path = socket_path
-        self.server_socket: Optional[socket.socket] = None
+        # "@name" selects a Linux abstract-namespace socket, which has no
+        # filesystem entry and disappears as soon as it is closed.
+        self.abstract = (socket_path.startswith('@') and
+                         sys.platform.startswith('linux'))
+        self.address = '\0' + socket_path[1:] if self.abstract else socket_path
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
         self.running = False
         self.thread: Optional[threading.Thread] = None
+        self.pool: Optional[ThreadPoolExecutor] = None
+        self.clients: Set[asyncio.StreamWriter] = set()
         self.command_handler: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None
 
     def start(self, command_handler: Callable[[Dict[str, Any]], Dict[str, Any]]) -> bool:
-        """Start the socket server in a background thread."""
+        """Start the socket server on an event loop in a background thread."""
         if self.running:
             return True
 
         self.command_handler = command_handler
 
         # Clean up any existing socket file
-        if os.path.exists(self.socket_path):
-            try:
-                os.unlink(self.socket_path)
-            except OSError:
-                pass
+        self._remove_socket_file()
 
+        self.loop = asyncio.new_event_loop()
         try:
-            self.server_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-            self.server_socket.bind(self.socket_path)
-            self.server_socket.listen(1)
-            self.server_socket.settimeout(1.0)  # Non-blocking with timeout
-
-            self.running = True
-            self.thread = threading.Thread(target=self._server_loop, daemon=True)
-            self.thread.start()
-
-            return True
+            # Bind here rather than in the thread so failures reach the caller
+            self.server = self.loop.run_until_complete(
+                asyncio.start_unix_server(self._handle_client,
+                                          path=self.address,
+                                          backlog=_ACCEPT_BACKLOG))
         except OSError as e:
-            print(f"[Splits] Failed to start socket server: {e}")
+            _logger.error("[Splits] Failed to start socket server: %s", e)
+            self.loop.close()
+            self.loop = None
             return False
 
+        # Commands run off the loop so a slow handler can't stall reading
+        # and writing for other clients, but one at a time: the handler's
+        # check-then-act timer updates are not safe to run concurrently.
+        self.pool = ThreadPoolExecutor(max_workers=1,
+                                       thread_name_prefix='splits-io')
+        self.running = True
+        self.thread = threading.Thread(target=self._run_loop, daemon=True)
+        self.thread.start()
+
+        return True
+
     def stop(self) -> None:
         """Stop the socket server."""
         self.running = False
 
-        if self.server_socket:
+        # call_soon_threadsafe() writes to the loop's internal socketpair, so
+        # the server thread wakes immediately; it never polls while idle.
+        if self.loop is not None:
             try:
-                self.server_socket.close()
-            except OSError:
-                pass
-            self.server_socket = None
-
-        # Clean up socket file
-        if os.path.exists(self.socket_path):
-            try:
-                os.unlink(self.socket_path)
-            except OSError:
-                pass
+                self.loop.call_soon_threadsafe(self._shutdown)
+            except RuntimeError:
+                pass  # Loop already closed
 
         if self.thread and self.thread.is_alive():
             self.thread.join(timeout=2.0)
 
-    def _server_loop(self) -> None:
-        """Main server loop handling client connections."""
-        while self.running:
-            try:
-                client_socket, _ = self.server_socket.accept()
-                self._handle_client(client_socket)
-            except socket.timeout:
-                continue  # Expected timeout for clean shutdown
-            except OSError:
-                break  # Socket closed
-
-    def _handle_client(self, client_socket: socket.socket) -> None:
+        if self.pool is not None:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+            self.pool = None
+
+        self.server = None
+        self.loop = None
+
+        # Clean up socket file
+        self._remove_socket_file()
+
+    def _remove_socket_file(self) -> None:
+        """Unlink the socket file, if any, without a separate exists check."""
+        if self.abstract:
+            return
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass  # Already gone, or not ours to remove
+
+    def _run_loop(self) -> None:
+        """Run the event loop until stop() is called."""
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_forever()
+        finally:
+            # Let clients disconnected by _shutdown() finish up
+            tasks = asyncio.all_tasks(self.loop)
+            self.loop.run_until_complete(
+                asyncio.gather(*tasks, return_exceptions=True))
+            self.loop.close()
+
+    def _shutdown(self) -> None:
+        """Close the listening socket and stop the loop (loop thread only)."""
+        if self.server is not None:
+            self.server.close()
+        # Persistent clients would otherwise keep their handlers waiting
+        for writer in self.clients:
+            writer.close()
+        self.loop.stop()
+
+    async def _handle_client(self, reader: asyncio.StreamReader,
+                             writer: asyncio.StreamWriter) -> None:
         """Handle a single client connection."""
+        self.clients.add(writer)
         try:
             # Receive command
-            data = client_socket.recv(1024)
+            data = await reader.read(1024)
             if not data:
                 return
 
-            try:
-                command = json.loads(data.decode('utf-8'))
-                if not isinstance(command, dict) or 'command' not in command:
-                    response = {"response": "error", "error": "invalid_command"}
-                else:
-                    response = self.command_handler(command)
-            except json.JSONDecodeError:
-                response = {"response": "error", "error": "invalid_json"}
-
-            # Send response
-            response_data = json.dumps(response).encode('utf-8')
-            client_socket.send(response_data)
-
-        except Exception as e:
-            print(f"[Splits] Socket client error: {e}")
+            # Framed clients prefix each message with its length. Bare JSON
+            # never contains a NUL byte, while any length below
+            # _MAX_FRAME_SIZE has a zero high byte, so one check tells the
+            # two protocols apart.
+            if b'\0' not in data[:_HEADER.size]:
+                response_data = bytearray()
+                await self._dispatch(data, response_data)
+                # write() queues whatever the kernel does not take
+                # immediately, so unlike socket.send() a partial write
+                # cannot drop data.
+                writer.write(response_data)
+                await writer.drain()
+                return
+
+            # Framed connections stay open for any number of commands.
+            # Replies are encoded into one reused buffer behind the header.
+            response_data = bytearray(_RESPONSE_BUFFER_SIZE)
+            while True:
+                if len(data) < _HEADER.size:
+                    data += await reader.readexactly(_HEADER.size - len(data))
+                length, = _HEADER.unpack_from(data)
+                if length > _MAX_FRAME_SIZE:
+                    response_data[_HEADER.size:] = _ERR_FRAME_TOO_LARGE
+                    _HEADER.pack_into(response_data, 0,
+                                      len(_ERR_FRAME_TOO_LARGE))
+                    writer.write(response_data)
+                    await writer.drain()
+                    return
+
+                end = _HEADER.size + length
+                if len(data) < end:
+                    data += await reader.readexactly(end - len(data))
+                # The decoders read straight from a view of the frame
+                await self._dispatch(memoryview(data)[_HEADER.size:end],
+                                     response_data, _HEADER.size)
+                _HEADER.pack_into(response_data, 0,
+                                  len(response_data) - _HEADER.size)
+                writer.write(response_data)
+                await writer.drain()
+                if writer.transport.get_write_buffer_size():
+                    # The transport may still hold a view of the buffer
+                    response_data = bytearray(_RESPONSE_BUFFER_SIZE)
+
+                data = data[end:]
+                if not data:
+                    data = await reader.read(1024)
+                    if not data:
+                        return  # Client closed the connection
+
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass  # Client went away mid-message
+        except OSError as e:
+            _logger.warning("[Splits] Socket client error: %s", e)
         finally:
-            try:
-                client_socket.close()
-            except OSError:
-                pass
\ No newline at end of file
+            self.clients.discard(writer)
+            writer.close()
+
+    async def _dispatch(self, data: Union[bytes, memoryview],
+                        out: bytearray, offset: int = 0) -> None:
+        """Run one JSON command and encode the reply into out[offset:].
+
+        A message holding several newline-delimited commands is run in
+        order, with each reply written back on its own line.
+        """
+        try:
+            command = _json_loads(data)
+        except (_JSONDecodeError, _CommandTypeError) as e:
+            data = bytes(data)
+            if b'\n' not in data:
+                out[offset:] = (_ERR_INVALID_COMMAND
+                                if isinstance(e, _CommandTypeError)
+                                else _ERR_INVALID_JSON)
+                return
+            del out[offset:]
+            for line in data.split(b'\n'):
+                if not line.strip():
+                    continue
+                await self._dispatch(line, out, len(out))
+                out += b'\n'
+            return
+
+        if not isinstance(command, dict) or 'command' not in command:
+            out[offset:] = _ERR_INVALID_COMMAND
+            return
+
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(
+            self.pool, self.command_handler, command)
+        _json_encode_into(response, out, offset)
@@ -11,126 +11,309 @@ import time
 import json
 import os
 import re
-import base64
+import binascii
+import ctypes
+import functools
 from evdev import InputDevice, ecodes, list_devices
 from select import select
 from datetime import datetime
 from socket_server import SplitSocketServer
 
+# Seconds to wait after a history change before writing the file, so a
+# burst of changes costs one write.
+HISTORY_FLUSH_DELAY = 0.5
+
+# The per-user runtime directory and /dev/shm are tmpfs, so the frequent
+# SVG rewrites never touch a disk; /tmp may not be.
+SVG_PATH = os.path.join(
+    os.environ.get("XDG_RUNTIME_DIR") or
+    ("/dev/shm" if os.path.isdir("/dev/shm") else "/tmp"),
+    "obs_splits.svg")
+
+# The running timer shows hundredths; redrawing more often than this
+# cannot change what is displayed. OBS ticks once per frame, so this only
+# skips frames above 100 fps; at usual frame rates every tick renders.
+RENDER_INTERVAL = 0.01
+
+# Seconds between checks that the input thread is still running
+MONITOR_CHECK_INTERVAL = 1.0
+
+# inotify events that mean a device node appeared or became readable
+# (udev fixes up permissions after creating the node).
+_IN_ATTRIB = 0x004
+_IN_CREATE = 0x100
+
+# Zero-padded two-digit strings for minutes, seconds and hours
+_TWO_DIGIT = tuple(f"{i:02d}" for i in range(100))
+
+# Run keys in the old flat history format
+_RUN_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+# orjson parses and serializes several times faster than the stdlib; both
+# paths work on bytes and write tab-indented history files.
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+    # JSON strings cannot hold a raw newline, so leading spaces on a line
+    # are always indentation.
+    _INDENT_RE = re.compile(rb'^(?:  )+', re.MULTILINE)
+
+    def _json_dumps_indented(obj):
+        data = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        return _INDENT_RE.sub(
+            lambda m: b'\t' * (len(m.group()) // 2), data)
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps_indented(obj):
+        return json.dumps(obj, indent='\t').encode('utf-8')
+
+
+def _cumulative(times):
+    """Running totals of times, skipping gaps; None before the first."""
+    totals = []
+    total = None
+    for t in times:
+        if t is not None:
+            total = t if total is None else total + t
+        totals.append(total)
+    return totals
+
+
+def _watch_input_devices(path="/dev/input"):
+    """Open a non-blocking inotify fd for new devices in path.
+
+    Returns None where inotify is unavailable.
+    """
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    if libc.inotify_add_watch(fd, os.fsencode(path),
+                              _IN_CREATE | _IN_ATTRIB) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+@functools.lru_cache(maxsize=8)
+def _encode_image(path, mtime_ns, size):
+    """Read an image into a data URI; mtime_ns and size key the cache."""
+    try:
+        ext = os.path.splitext(path)[1].lower().strip(".")
+        mime = f"image/{ext}" if ext != "jpg" else "image/jpeg"
+        with open(path, "rb") as img_file:
+            b64_string = binascii.b2a_base64(
+                img_file.read(), newline=False).decode("ascii")
+        return f"data:{mime};base64,{b64_string}"
+    except Exception:
+        return None
+
+
+class RunComparison:
+    """PB and best segments a run is compared against, fixed at its start.
+
+    best, pb_run and pb_total are the history aggregates kept by
+    SplitsData (see SplitsTimer.summarize_history).
+    """
+
+    __slots__ = ('split_names', 'pb_segments', 'best_segments', 'pb_total',
+                 'pb_cumulative', 'best_cumulative')
+
+    def __init__(self, split_names=None, best=None, pb_run=None,
+                 pb_total=None):
+        self.split_names = split_names
+        self.pb_total = pb_total
+        self.best_segments = {}
+        self.pb_segments = {}
+        if split_names is not None:
+            self.best_segments = {
+                name: best[name] for name in split_names if name in best}
+            if pb_run:
+                self.pb_segments = {
+                    name: pb_run[name] for name in split_names
+                    if name in pb_run}
+        # Running totals along split_names, so renders needn't re-add them
+        self.pb_cumulative = _cumulative(
+            [self.pb_segments.get(name) for name in split_names or ()])
+        self.best_cumulative = _cumulative(
+            [self.best_segments.get(name) for name in split_names or ()])
+
+    def get_cumulative(self, split_names, sob=False):
+        """Cumulative PB (or SoB) comparison time at each split."""
+        if split_names is self.split_names:
+            return self.best_cumulative if sob else self.pb_cumulative
+        segments = self.best_segments if sob else self.pb_segments
+        return _cumulative([segments.get(name) for name in split_names])
+
+
+class TimerState:
+    """Snapshot of the run state; never changed once published.
+
+    SplitsTimer replaces its state in a single assignment, so a reader on
+    another thread that takes timer.state once sees a consistent split
+    index, run flag, split times and comparison.
+    """
+
+    __slots__ = ('timer_running', 'current_split_index', 'start_time',
+                 'split_times', 'comparison')
+
+    def __init__(self, timer_running=False, current_split_index=-1,
+                 start_time=0, split_times=(), comparison=None):
+        self.timer_running = timer_running
+        self.current_split_index = current_split_index
+        self.start_time = start_time
+        self.split_times = split_times
+        self.comparison = (comparison if comparison is not None else
+                           RunComparison())
+
+    def get_elapsed(self, now=None):
+        """Get total elapsed time, optionally as of now."""
+        if self.timer_running:
+            if now is None:
+                now = time.monotonic()
+            return now - self.start_time
+        elif self.split_times:
+            return self.split_times[-1]
+        return 0
+
 
 class SplitsTimer:
-    """Manages the speedrun timer state and logic."""
+    """Manages the speedrun timer state and logic.
+
+    All timing uses time.monotonic(): the wall clock can jump (NTP, DST,
+    manual changes) and would corrupt split times mid-run.
+    """
+
+    __slots__ = ('state',)
 
     def __init__(self):
-        self.current_split_index = -1
-        self.start_time = 0
-        self.split_times = []
-        self.timer_running = False
-        self.comparison_pb_segments = {}
-        self.comparison_best_segments = {}
-        self.comparison_pb_total = None
-
-    def start(self, split_names, segment_history):
-        """Initialize and start a new run."""
-        self.comparison_pb_segments = {}
-        self.comparison_best_segments = {}
-
-        # Find PB run
-        pb_run = None
-        min_total = None
-        for run_data in segment_history.values():
-            run_total = sum(run_data.values())
-            if min_total is None or run_total < min_total:
-                min_total = run_total
-                pb_run = run_data
+        self.state = TimerState()
 
-        self.comparison_pb_total = min_total
+    # Read-only views of the current state; code that reads several
+    # fields together should take self.state once instead
+    @property
+    def timer_running(self):
+        return self.state.timer_running
 
-        for i, name in enumerate(split_names):
-            # Best segment ever
-            best_seg = self._get_best_segment(i, split_names,
-                                              segment_history)
-            if best_seg is not None:
-                self.comparison_best_segments[name] = best_seg
+    @property
+    def current_split_index(self):
+        return self.state.current_split_index
 
-            # PB run segment
-            if pb_run and name in pb_run:
-                self.comparison_pb_segments[name] = pb_run[name]
+    @property
+    def split_times(self):
+        return self.state.split_times
 
-        self.start_time = time.time()
-        self.timer_running = True
-        self.current_split_index = 0
-        self.split_times = []
+    def start(self, split_names, best, pb_run, pb_total):
+        """Initialize and start a new run.
+
+        best, pb_run and pb_total are the history aggregates kept by
+        SplitsData (see summarize_history).
+        """
+        self.state = TimerState(
+            True, 0, time.monotonic(),
+            comparison=RunComparison(split_names, best, pb_run, pb_total))
 
     def split(self, split_names):
         """Record a split time."""
-        if not self.timer_running:
+        state = self.state
+        if not state.timer_running:
             return False
 
-        elapsed = time.time() - self.start_time
-        self.split_times.append(elapsed)
+        index = state.current_split_index
+        split_times = state.split_times + (
+            time.monotonic() - state.start_time,)
 
-        if self.current_split_index >= len(split_names) - 1:
-            self.timer_running = False
+        if index >= len(split_names) - 1:
+            self.state = TimerState(False, index, state.start_time,
+                                    split_times, state.comparison)
             return True
         else:
-            self.current_split_index += 1
+            self.state = TimerState(True, index + 1, state.start_time,
+                                    split_times, state.comparison)
             return False
 
     def reset(self):
         """Reset the timer."""
-        self.current_split_index = -1
-        self.timer_running = False
-        self.split_times = []
+        self.state = TimerState(comparison=self.state.comparison)
 
-    def get_current_elapsed(self):
-        """Get current total elapsed time."""
-        if self.timer_running:
-            return time.time() - self.start_time
-        elif self.split_times:
-            return self.split_times[-1]
-        return 0
+    def get_current_elapsed(self, now=None):
+        """Get current total elapsed time, optionally as of now."""
+        return self.state.get_elapsed(now)
 
     @staticmethod
-    def _get_best_segment(index, split_names, segment_history):
-        """Get the best time for a specific segment."""
-        if index < 0 or index >= len(split_names):
-            return None
-        name = split_names[index]
-        best_times = []
+    def summarize_history(segment_history):
+        """Find best segment times and the PB run in a single pass.
+
+        Returns (best time by split name, PB run, PB total).
+        """
+        best = {}
+        pb_run = None
+        min_total = None
         for run_data in segment_history.values():
-            if name in run_data:
-                best_times.append(run_data[name])
-        return min(best_times) if best_times else None
+            run_total = 0
+            for name, seg_time in run_data.items():
+                run_total += seg_time
+                cur = best.get(name)
+                if cur is None or seg_time < cur:
+                    best[name] = seg_time
+            if min_total is None or run_total < min_total:
+                min_total = run_total
+                pb_run = run_data
+        return best, pb_run, min_total
 
 
 class SplitsData:
     """Manages splits data and history."""
 
+    __slots__ = ('splits_file_path', 'history_file_path', 'game_name',
+                 'category_name', 'game_image_path', 'split_names', 'n_splits',
+                 'full_history', 'segment_history', 'best_by_name', 'pb_run',
+                 'pb_total', 'best_times', 'best_cumulative',
+                 'pb_cumulative', 'revision', '_history_dirty',
+                 '_history_dirty_since', '_raw_key', '_raw_data',
+                 '_history_key')
+
     def __init__(self):
         self.splits_file_path = ""
         self.history_file_path = ""
         self.game_name = ""
         self.category_name = ""
         self.game_image_path = ""
-        self.split_names = []
+        self.split_names = ()
+        self.n_splits = 0
         self.full_history = {}
         self.segment_history = {}
+        # Best segment per split name and the PB run, from segment_history
+        self.best_by_name = {}
+        self.pb_run = None
+        self.pb_total = None
+        # The same along split_names, with running totals
+        self.best_times = []
+        self.best_cumulative = []
+        self.pb_cumulative = []
+        self.revision = 0
+        self._history_dirty = False
+        self._history_dirty_since = 0.0
+        # Last get_splits_data_raw() result and the file state it came from
+        self._raw_key = None
+        self._raw_data = None
+        # (path, mtime_ns, size) of the history file full_history matches
+        self._history_key = None
 
     def load_splits(self, splits_file_path):
         """Load splits from JSON file."""
+        # Pending changes belong to the file we are about to switch away from
+        self.flush_history(force=True)
         self.splits_file_path = splits_file_path
+        self.revision += 1
 
-        if not splits_file_path or not os.path.exists(splits_file_path):
-            return False
-
-        try:
-            with open(splits_file_path, 'r') as f:
-                data = json.load(f)
-        except Exception as e:
-            self._log(f"Error reading JSON: {e}")
-            return False
-
+        # Shares the parsed file with the properties dialog
+        data = self.get_splits_data_raw()
         if not data:
             return False
 
@@ -143,17 +326,22 @@ class SplitsData:
                 if self.category_name in categories:
                     self.split_names = categories[self.category_name]
                 elif categories:
-                    self.category_name = list(categories.keys())[0]
+                    self.category_name = next(iter(categories))
                     self.split_names = categories[self.category_name]
             else:
-                self.game_name = list(data.keys())[0]
+                self.game_name = next(iter(data))
                 game_data = data[self.game_name]
                 self.game_image_path = game_data.get("image", "")
                 categories = game_data.get("categories", {})
                 if categories:
-                    self.category_name = list(categories.keys())[0]
+                    self.category_name = next(iter(categories))
                     self.split_names = categories[self.category_name]
 
+            # Fixed for the life of the loaded file; readers may rely on
+            # split_names only ever being replaced, never mutated
+            self.split_names = tuple(self.split_names)
+            self.n_splits = len(self.split_names)
+
             self.history_file_path = splits_file_path.replace(
                 ".json", "_history.json")
             self._load_history()
@@ -163,22 +351,37 @@ class SplitsData:
             return False
 
     def _load_history(self):
-        """Load run history from file."""
-        self.full_history = {}
-        if os.path.exists(self.history_file_path):
-            with open(self.history_file_path, 'r') as f:
+        """Load run history from file.
+
+        The file is only parsed again if it changed since it was last
+        read or written, so settings changes don't re-read a long history.
+        """
+        path = self.history_file_path
+        try:
+            st = os.stat(path)
+            key = (path, st.st_mtime_ns, st.st_size)
+        except OSError:
+            key = None
+        if key is None or key != self._history_key:
+            self._history_key = key
+            self.full_history = {}
+            try:
+                with open(path, 'rb') as f:
+                    raw = f.read()
+            except FileNotFoundError:
+                raw = None  # No runs saved yet
+            if raw is not None:
                 try:
-                    self.full_history = json.load(f)
+                    self.full_history = _json_loads(raw)
                 except Exception as e:
                     self._log(f"Error parsing history JSON: {e}")
                     self.full_history = {}
 
-        # Migration: Check old flat format
-        is_old_format = False
-        for k in self.full_history.keys():
-            if re.match(r'\d{4}-\d{2}-\d{2}', str(k)):
-                is_old_format = True
-                break
+        # Migration: Check old flat format. Its keys are all run dates and
+        # the nested format's are all game names, so the first key decides.
+        first_key = next(iter(self.full_history), None)
+        is_old_format = (first_key is not None and
+                         _RUN_DATE_RE.match(str(first_key)) is not None)
 
         if is_old_format:
             self._log("Migrating old flat history to nested format...")
@@ -196,20 +399,76 @@ class SplitsData:
         self.segment_history = (
             self.full_history[self.game_name][self.category_name]
         )
+        self._update_aggregates()
+
+    def _update_aggregates(self):
+        """Recompute best segments and the PB run after history changes."""
+        self.best_by_name, self.pb_run, self.pb_total = (
+            SplitsTimer.summarize_history(self.segment_history))
+        self._update_split_aggregates()
+
+    def _add_run_to_aggregates(self, run_data):
+        """Fold one newly added run into the aggregates.
+
+        Matches _update_aggregates() for a run appended to the history,
+        without rescanning every earlier run.
+        """
+        best = self.best_by_name
+        run_total = 0
+        for name, seg_time in run_data.items():
+            run_total += seg_time
+            cur = best.get(name)
+            if cur is None or seg_time < cur:
+                best[name] = seg_time
+        if self.pb_total is None or run_total < self.pb_total:
+            self.pb_total = run_total
+            self.pb_run = run_data
+        self._update_split_aggregates()
+
+    def _update_split_aggregates(self):
+        """Recompute the per-split lists from the best and PB times."""
+        self.best_times = [self.best_by_name.get(name)
+                           for name in self.split_names]
+        self.best_cumulative = _cumulative(self.best_times)
+        pb_run = self.pb_run or {}
+        self.pb_cumulative = _cumulative([pb_run.get(name)
+                                          for name in self.split_names])
 
     def _save_history(self):
-        """Save run history to file."""
+        """Mark the history as changed; flush_history() writes it out."""
         if not self.history_file_path:
             return
+        if not self._history_dirty:
+            self._history_dirty = True
+            self._history_dirty_since = time.monotonic()
+
+    def flush_history(self, force=False):
+        """Write pending history changes once the flush delay has passed.
+
+        The file is written to a temporary path and renamed over the old
+        one, so an interrupted write never leaves a truncated history.
+        """
+        if not self._history_dirty:
+            return
+        if (not force and time.monotonic() - self._history_dirty_since <
+                HISTORY_FLUSH_DELAY):
+            return
+        self._history_dirty = False
+        tmp_path = self.history_file_path + ".tmp"
         try:
-            with open(self.history_file_path, 'w') as f:
-                json.dump(self.full_history, f, indent='\t')
+            with open(tmp_path, 'wb') as f:
+                f.write(_json_dumps_indented(self.full_history))
+            os.replace(tmp_path, self.history_file_path)
+            # What we just wrote matches full_history; don't parse it back
+            st = os.stat(self.history_file_path)
+            self._history_key = (self.history_file_path, st.st_mtime_ns,
+                                 st.st_size)
         except Exception as e:
             self._log(f"Error saving history: {e}")
 
     def save_run(self, split_times):
         """Save completed run to history."""
-        if len(split_times) != len(self.split_names):
+        if len(split_times) != self.n_splits:
             return
 
         run_key = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -220,20 +479,41 @@ class SplitsData:
             segment_time = split_times[i] - prev_total
             run_data[name] = round(segment_time, 2)
 
-        self.segment_history[run_key] = run_data
+        if run_key in self.segment_history:
+            # Replaces a run from the same second; rescan everything
+            self.segment_history[run_key] = run_data
+            self._update_aggregates()
+        else:
+            self.segment_history[run_key] = run_data
+            self._add_run_to_aggregates(run_data)
+        self.revision += 1
         self._save_history()
 
     def get_splits_data_raw(self):
-        """Get raw JSON data for property population."""
-        if not self.splits_file_path or not os.path.exists(
-                self.splits_file_path):
+        """Get raw JSON data for property population.
+
+        The parsed file is reused until its path, mtime or size changes.
+        """
+        if not self.splits_file_path:
+            self._raw_key = self._raw_data = None
+            return None
+        try:
+            st = os.stat(self.splits_file_path)
+        except OSError:
+            self._raw_key = self._raw_data = None
             return None
+        key = (self.splits_file_path, st.st_mtime_ns, st.st_size)
+        if key == self._raw_key:
+            return self._raw_data
         try:
-            with open(self.splits_file_path, 'r') as f:
-                return json.load(f)
+            with open(self.splits_file_path, 'rb') as f:
+                data = _json_loads(f.read())
         except Exception as e:
             self._log(f"Error reading JSON: {e}")
             return None
+        self._raw_key = key
+        self._raw_data = data
+        return data
 
     @staticmethod
     def _log(message):
@@ -246,10 +526,16 @@ class SplitsData:
 class InputMonitor:
     """Monitors gamepad input for split/reset commands."""
 
+    __slots__ = ('on_split', 'on_reset', 'thread', 'gamepad',
+                 'device_blacklist', 'device_filter', 'input_code',
+                 'last_press_time', 'hold_threshold', 'is_held',
+                 'reset_triggered', 'debug_status', '_probe_cache',
+                 '_stop_event', '_wake_r', '_wake_w', '_watch_fd',
+                 '_last_path')
+
     def __init__(self, on_split, on_reset):
         self.on_split = on_split
         self.on_reset = on_reset
-        self.running = True
         self.thread = None
         self.gamepad = None
         self.device_blacklist = ""
@@ -260,18 +546,52 @@ class InputMonitor:
         self.is_held = False
         self.reset_triggered = False
         self.debug_status = "Initializing..."
+        # Device path -> (node stat token, accepted) from earlier searches
+        self._probe_cache = {}
+        # Path of the last connected controller, tried first on a search
+        self._last_path = None
+        self._stop_event = threading.Event()
+        # Written to by stop() to wake the thread out of a blocking select
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_w, False)
+        # Readable when a device node is added, so a missing controller is
+        # looked for again only when one may have been plugged in.
+        self._watch_fd = _watch_input_devices()
 
     def start(self):
         """Start the input monitoring thread."""
         if self.thread is None or not self.thread.is_alive():
-            self.running = True
+            self._stop_event.clear()
             self.thread = threading.Thread(target=self._monitor_loop,
                                            daemon=True)
             self.thread.start()
 
     def stop(self):
         """Stop the input monitoring thread."""
-        self.running = False
+        self._stop_event.set()
+        self._wake()
+
+    def close(self):
+        """Stop the thread and close the wake pipe and inotify watch.
+
+        The monitor cannot be started again afterwards.
+        """
+        if self._wake_w is None:
+            return  # Already closed
+        self.stop()
+        if self.thread is not None:
+            self.thread.join(timeout=2.0)
+        for fd in (self._wake_r, self._wake_w, self._watch_fd):
+            if fd is not None:
+                os.close(fd)
+        self._wake_r = self._wake_w = self._watch_fd = None
+
+    def _wake(self):
+        """Interrupt the thread's current wait."""
+        try:
+            os.write(self._wake_w, b'\0')
+        except BlockingIOError:
+            pass  # A wakeup is already pending
 
     def _monitor_loop(self):
         """Main input monitoring loop."""
@@ -279,11 +599,11 @@ class InputMonitor:
         self.debug_status = "Monitor Started"
 
         try:
-            while self.running:
+            while not self._stop_event.is_set():
                 if self.gamepad is None:
                     self._search_for_gamepad()
                     if not self.gamepad:
-                        time.sleep(1)
+                        self._wait_for_device()
                         continue
 
                 try:
@@ -324,43 +644,41 @@ class InputMonitor:
         self._log(f"Searching for controller among {len(all_paths)} "
                   f"devices...")
 
+        # A controller that dropped out usually comes back on the same
+        # node, so look there before probing anything else
+        last_path = self._last_path
+        if last_path in all_paths:
+            all_paths.remove(last_path)
+            all_paths.insert(0, last_path)
+
+        probe_cache = self._probe_cache
         for path in all_paths:
+            # A replugged device gets a new node, so the stat result tells
+            # whether an earlier verdict still applies.
             try:
-                dev = InputDevice(path)
-            except Exception:
+                st = os.stat(path)
+            except OSError:
                 continue
+            token = (st.st_ino, st.st_rdev, st.st_mtime_ns)
+            cached = probe_cache.get(path)
+            if cached is not None and cached[0] == token and not cached[1]:
+                continue  # Rejected before; skip opening and probing it
 
-            # Check blacklist
-            dev_name = dev.name.lower()
-            if any(term in dev_name for term in blacklist_terms):
-                self._log(f"Skipping blacklisted device: {dev.name} "
-                          f"({path})")
-                dev.close()
-                continue
-
-            # Check filter
-            if filter_term and filter_term not in dev_name:
-                self._log(f"Skipping device (doesn't match filter): "
-                          f"{dev.name} ({path})")
-                dev.close()
+            try:
+                dev = InputDevice(path)
+            except Exception:
                 continue
 
-            is_match = False
-            # Check capabilities
-            try:
-                caps = dev.capabilities(verbose=False)
-                if ecodes.EV_KEY in caps:
-                    key_caps = caps[ecodes.EV_KEY]
-                    # Require BOTH BTN_GAMEPAD and input_code
-                    if (ecodes.BTN_GAMEPAD in key_caps and
-                            self.input_code in key_caps):
-                        is_match = True
-            except Exception as e:
-                self._log(f"Error checking capabilities for "
-                          f"{dev.name}: {e}")
+            if cached is not None and cached[0] == token:
+                is_match = True
+            else:
+                is_match = self._probe_device(dev, path, blacklist_terms,
+                                              filter_term)
+                probe_cache[path] = (token, is_match)
 
             if is_match:
                 self.gamepad = dev
+                self._last_path = path
                 self._log(f"Controller connected: {dev.name} "
                           f"({dev.path})", obs.LOG_INFO)
                 self.debug_status = f"Connected: {dev.name}"
@@ -368,29 +686,104 @@ class InputMonitor:
             else:
                 dev.close()
 
+    def _probe_device(self, dev, path, blacklist_terms, filter_term):
+        """Check whether a device is an allowed gamepad with our button."""
+        # Check blacklist
+        dev_name = dev.name.lower()
+        if any(term in dev_name for term in blacklist_terms):
+            self._log(f"Skipping blacklisted device: {dev.name} "
+                      f"({path})")
+            return False
+
+        # Check filter
+        if filter_term and filter_term not in dev_name:
+            self._log(f"Skipping device (doesn't match filter): "
+                      f"{dev.name} ({path})")
+            return False
+
+        # Check capabilities
+        try:
+            caps = dev.capabilities(verbose=False)
+            if ecodes.EV_KEY in caps:
+                key_caps = caps[ecodes.EV_KEY]
+                # Require BOTH BTN_GAMEPAD and input_code
+                if (ecodes.BTN_GAMEPAD in key_caps and
+                        self.input_code in key_caps):
+                    return True
+        except Exception as e:
+            self._log(f"Error checking capabilities for "
+                      f"{dev.name}: {e}")
+        return False
+
+    def clear_probe_cache(self):
+        """Forget earlier device verdicts, e.g. after a filter change."""
+        self._probe_cache = {}
+        # Search again now rather than at the next device event
+        self._wake()
+
+    def _wait_for_device(self):
+        """Sleep until a device may have been added or stop() is called."""
+        watch_fd = self._watch_fd
+        if watch_fd is None:
+            self._stop_event.wait(1)  # No inotify; poll instead
+            return
+        if self._wait(watch_fd, None):
+            # Drain the queued events; the next search rescans anyway
+            try:
+                while os.read(watch_fd, 4096):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def _wait(self, fd, timeout):
+        """Block until fd is readable, stop() is called or timeout passes.
+
+        Returns True if fd is readable.
+        """
+        r, w, x = select([fd, self._wake_r], [], [], timeout)
+        if self._wake_r in r:
+            os.read(self._wake_r, 64)
+        return fd in r
+
     def _process_input(self):
         """Process input events from gamepad."""
-        r, w, x = select([self.gamepad.fd], [], [], 0.1)
-
+        # Sleep until the kernel has events for us; only wake up early
+        # while a press is held, to detect the reset hold.
+        timeout = None
         if self.is_held and not self.reset_triggered:
-            if (time.time() - self.last_press_time) > self.hold_threshold:
+            remaining = self.hold_threshold - (time.monotonic() -
+                                               self.last_press_time)
+            if remaining <= 0:
                 self.on_reset()
                 self.reset_triggered = True
+            else:
+                timeout = remaining
 
-        if r:
-            self.debug_status = f"Active: {self.gamepad.name}"
-            for event in self.gamepad.read():
-                if (event.type == ecodes.EV_KEY and
-                        event.code == self.input_code):
-                    if event.value == 1:
-                        self.last_press_time = time.time()
-                        self.is_held = True
-                        self.reset_triggered = False
-                    elif event.value == 0:
-                        self.is_held = False
-                        if not self.reset_triggered:
-                            self.on_split()
-                        self.reset_triggered = False
+        if not self._wait(self.gamepad.fd, timeout):
+            return
+        self.debug_status = f"Active: {self.gamepad.name}"
+        # Drain everything the kernel has queued in one read; a busy pad
+        # delivers many axis events per frame that we skip straight away.
+        # read() is a generator: the read itself, and so BlockingIOError,
+        # only happens once it is iterated
+        try:
+            events = list(self.gamepad.read())
+        except BlockingIOError:
+            return  # Woken without a complete event
+        ev_key = ecodes.EV_KEY
+        input_code = self.input_code
+        for event in events:
+            if event.type != ev_key or event.code != input_code:
+                continue
+            if event.value == 1:
+                self.last_press_time = time.monotonic()
+                self.is_held = True
+                self.reset_triggered = False
+            elif event.value == 0:
+                self.is_held = False
+                if not self.reset_triggered:
+                    self.on_split()
+                self.reset_triggered = False
 
     @staticmethod
     def _log(message, level=None):
@@ -405,6 +798,20 @@ class InputMonitor:
 class SVGRenderer:
     """Renders the splits display as SVG."""
 
+    __slots__ = ('bg_color', 'bg_opacity', 'corner_radius', 'font_scale',
+                 'line_spacing', 'show_ms', 'show_best_segment_time',
+                 'show_deltas', 'comparison_type', 'delta_type',
+                 'use_dynamic_height', 'height_setting', 'svg_width',
+                 'text_color', 'highlight_color', 'gold_color', 'green_color',
+                 'red_color', 'active_segment_bg', 'separator_color',
+                 'normal_font', 'mono_font', '_settings_key', '_rgba_str',
+                 '_cache_key', '_cache_svg', '_row_center_offset',
+                 '_header_tmpl', '_active_tmpl', '_row_tmpl',
+                 '_row_delta_tmpl', '_footer_tmpl', '_rows_key', '_rows')
+
+    # Zero time at each supported number of decimal places
+    _ZERO_TIMES = {0: "00:00", 1: "00:00.0", 2: "00:00.00"}
+
     def __init__(self):
         self.bg_color = "#1e1e1e"
         self.bg_opacity = 100
@@ -428,19 +835,95 @@ class SVGRenderer:
         self.separator_color = "#444444"
         self.normal_font = "Nunito"
         self.mono_font = "Courier New"
-
-    def render(self, data, timer):
-        """Render the splits display."""
+        self._settings_key = None
+        self._rgba_str = None
+        self._cache_key = None
+        self._cache_svg = None
+        self._rows_key = None
+        self._rows = None
+        self.update_settings()
+
+    def update_settings(self):
+        """Recompute state derived from the display settings."""
+        self._settings_key = (
+            self.bg_color, self.bg_opacity, self.corner_radius,
+            self.font_scale, self.line_spacing, self.show_ms,
+            self.show_best_segment_time, self.show_deltas,
+            self.comparison_type, self.delta_type, self.use_dynamic_height,
+            self.height_setting, self.svg_width, self.text_color,
+            self.highlight_color, self.gold_color, self.green_color,
+            self.red_color, self.active_segment_bg, self.separator_color,
+            self.normal_font, self.mono_font)
+        self.update_background()
+
+        # Markup templates with the settings baked in; render() only fills
+        # in positions, text and state-dependent colours.
+        fs = self.font_scale
+        nf, mf = self.normal_font, self.mono_font
+        self._row_center_offset = 16 * fs * 0.35
+        self._header_tmpl = (
+            f'<text x="{{x}}" y="{{title_y}}" '
+            f'fill="{self.highlight_color}" font-family="{nf}" '
+            f'font-size="{20 * fs}" font-weight="bold">{{game}}</text>'
+            f'<text x="{{x}}" y="{{category_y}}" '
+            f'fill="{self.text_color}" font-family="{nf}" '
+            f'font-size="{14 * fs}">{{category}}</text>'
+            f'<line x1="20" y1="{{line_y}}" x2="380" y2="{{line_y}}" '
+            f'stroke="{self.separator_color}" stroke-width="1"/>')
+        self._active_tmpl = (
+            f'<rect x="5" y="{{y}}" width="390" '
+            f'height="{self.line_spacing}" rx="8" '
+            f'fill="{self.active_segment_bg}" opacity="0.9"/>')
+        name_tmpl = (
+            f'<text x="15" y="{{y}}" fill="{self.text_color}" '
+            f'font-family="{nf}" font-size="{16 * fs}">{{name}}</text>')
+        delta_tmpl = (
+            f'<text x="310" y="{{y}}" fill="{{delta_color}}" '
+            f'font-family="{mf}" font-size="{13 * fs}" '
+            f'text-anchor="end" opacity="0.9">{{delta}}</text>')
+        time_tmpl = (
+            f'<text x="385" y="{{y}}" fill="{self.text_color}" '
+            f'font-family="{mf}" font-size="{16 * fs}" '
+            f'text-anchor="end">{{time}}</text>')
+        self._row_tmpl = name_tmpl + time_tmpl
+        self._row_delta_tmpl = name_tmpl + delta_tmpl + time_tmpl
+        self._footer_tmpl = (
+            f'<text x="20" y="{{pb_y}}" fill="{self.text_color}" '
+            f'font-family="{nf}" font-size="{12 * fs}" opacity="0.7">PB: '
+            f'<tspan font-family="{mf}">{{pb}}</tspan></text>'
+            f'<text x="20" y="{{sob_y}}" fill="{self.text_color}" '
+            f'font-family="{nf}" font-size="{12 * fs}" opacity="0.7">SoB: '
+            f'<tspan font-family="{mf}">{{sob}}</tspan></text>'
+            f'<text x="380" y="{{timer_y}}" fill="{{timer_color}}" '
+            f'font-family="{mf}" font-size="{48 * fs}" '
+            f'font-weight="bold" text-anchor="end">{{timer}}</text>')
+
+    def update_background(self):
+        """Recompute the background fill from bg_color and bg_opacity."""
         hex_color = self.bg_color.lstrip('#')
         rgb = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-        rgba_str = (f"rgba({rgb[0]}, {rgb[1]}, {rgb[2]}, "
-                    f"{self.bg_opacity / 100})")
-
-        current_total_elapsed = timer.get_current_elapsed()
+        self._rgba_str = (f"rgba({rgb[0]}, {rgb[1]}, {rgb[2]}, "
+                          f"{self.bg_opacity / 100})")
+
+    def render(self, data, timer, now=None):
+        """Render the splits display, optionally as of a monotonic now."""
+        # Read the run state once; the input thread may replace it
+        state = timer.state
+        current_total_elapsed = state.get_elapsed(now)
+
+        # Reuse the last SVG while nothing it depends on has changed; the
+        # image's stat token catches the game image being edited in place
+        image_path = data.game_image_path
+        image_token = self._get_image_token(image_path)
+        cache_key = (current_total_elapsed, state.timer_running,
+                     state.current_split_index, len(state.split_times),
+                     data.revision, self._settings_key, image_token)
+        if cache_key == self._cache_key:
+            return self._cache_svg
 
         # Height Logic
         header_height = 90
-        splits_height = len(data.split_names) * self.line_spacing
+        splits_height = data.n_splits * self.line_spacing
         footer_height = 100
         content_height = header_height + splits_height + footer_height
 
@@ -458,59 +941,56 @@ class SVGRenderer:
             f'height="{total_svg_height}" '
             f'xmlns="http://www.w3.org/2000/svg">',
             f'<rect x="0" y="{content_start_y}" width="100%" '
-            f'height="{render_height}" fill="{rgba_str}" '
+            f'height="{render_height}" fill="{self._rgba_str}" '
             f'rx="{self.corner_radius}"/>'
         ]
+        # Every part goes through one bound append and is joined once
+        append = svg.append
 
         # Header
         text_x_start = 20
-        image_uri = self._get_image_data_uri(data.game_image_path)
+        image_uri = (_encode_image(image_path, *image_token)
+                     if image_token else None)
         if image_uri:
             img_size = 50 * self.font_scale
-            svg.append(
+            append(
                 f'<image href="{image_uri}" x="20" '
                 f'y="{content_start_y + 20}" width="{img_size}" '
                 f'height="{img_size}" />')
             text_x_start = 30 + img_size
 
-        svg.extend([
-            f'<text x="{text_x_start}" y="{content_start_y + 40}" '
-            f'fill="{self.highlight_color}" '
-            f'font-family="{self.normal_font}" '
-            f'font-size="{20 * self.font_scale}" font-weight="bold">'
-            f'{data.game_name}</text>',
-            f'<text x="{text_x_start}" y="{content_start_y + 65}" '
-            f'fill="{self.text_color}" '
-            f'font-family="{self.normal_font}" '
-            f'font-size="{14 * self.font_scale}">'
-            f'{data.category_name}</text>',
-            f'<line x1="20" y1="{content_start_y + 80}" x2="380" '
-            f'y2="{content_start_y + 80}" '
-            f'stroke="{self.separator_color}" stroke-width="1"/>'
-        ])
+        append(self._header_tmpl.format_map({
+            "x": text_x_start,
+            "title_y": content_start_y + 40,
+            "category_y": content_start_y + 65,
+            "line_y": content_start_y + 80,
+            "game": data.game_name,
+            "category": data.category_name,
+        }))
 
         # Splits
         y_offset = content_start_y + 110
         seg_decimals = 2 if self.show_ms else 0
 
+        # Per-split lookups shared by every row, computed once per render
+        best_history = data.best_times
+        comparison = state.comparison
+        comp_cumulative_list = comparison.get_cumulative(
+            data.split_names, self.comparison_type == "sob")
+        if self.show_best_segment_time:
+            comparison_times = self._get_comparison_times(data, state)
+
         # Calculate PB and SoB
-        if timer.timer_running or timer.current_split_index >= 0:
-            pb_total = timer.comparison_pb_total
-            sob_total = (sum(timer.comparison_best_segments.values()) if
-                         timer.comparison_best_segments else 0)
+        if state.timer_running or state.current_split_index >= 0:
+            pb_total = comparison.pb_total
+            sob_total = (sum(comparison.best_segments.values()) if
+                         comparison.best_segments else 0)
         else:
             sob_total = 0
-            for i in range(len(data.split_names)):
-                best_time = timer._get_best_segment(
-                    i, data.split_names, data.segment_history)
+            for best_time in best_history:
                 if best_time is not None:
                     sob_total += best_time
-
-            pb_total = None
-            for run_data in data.segment_history.values():
-                run_total = sum(run_data.values())
-                if pb_total is None or run_total < pb_total:
-                    pb_total = run_total
+            pb_total = data.pb_total
 
         # Color final timer relative to PB
         final_timer_color = self.text_color
@@ -519,121 +999,87 @@ class SVGRenderer:
                                  current_total_elapsed < pb_total else
                                  self.red_color)
 
+        # Bind everything the row loop reads to locals
+        fmt = self._format_clock
+        fmt_delta = self._format_delta
+        text_color = self.text_color
+        green_color, red_color = self.green_color, self.red_color
+        gold_color = self.gold_color
+        show_deltas = self.show_deltas
+        show_best_segment_time = self.show_best_segment_time
+        segment_delta = self.delta_type == "segment"
+        rows = self._get_rows(data.split_names, y_offset)
+        split_times = state.split_times
+        n_done = len(split_times)
+        current_index = state.current_split_index
+        timer_running = state.timer_running
+        # Use snapshots for comparison if available
+        use_snapshot = timer_running or current_index >= 0
+        best_segments = comparison.best_segments
+        empty_time = self._ZERO_TIMES[seg_decimals]
+
         for i, name in enumerate(data.split_names):
+            row_tmpl, row_delta_tmpl, active_rect = rows[i]
             time_str = ""
             delta_str = ""
-            segment_time_color = self.text_color
-            delta_time_color = self.text_color
-
-            prev_total = (timer.split_times[i - 1] if
-                          (i > 0 and len(timer.split_times) >= i) else 0)
-
-            if i == timer.current_split_index:
-                font_size = 16 * self.font_scale
-                text_center_offset = font_size * 0.35
-                rect_y = (y_offset - text_center_offset -
-                          self.line_spacing / 2)
-                svg.append(
-                    f'<rect x="5" y="{rect_y}" width="390" '
-                    f'height="{self.line_spacing}" rx="8" '
-                    f'fill="{self.active_segment_bg}" opacity="0.9"/>')
-
-            if i < len(timer.split_times):
-                actual_seg = timer.split_times[i] - prev_total
-                actual_cumulative = timer.split_times[i]
-
-                # Use snapshots for comparison if available
-                if (timer.timer_running or
-                        timer.current_split_index >= 0):
-                    comp_best = timer.comparison_best_segments.get(name)
-                    comp_pb = timer.comparison_pb_segments.get(name)
+            delta_time_color = text_color
+
+            prev_total = (split_times[i - 1] if
+                          (i > 0 and n_done >= i) else 0)
+
+            if i == current_index:
+                append(active_rect)
+
+            if i < n_done:
+                actual_cumulative = split_times[i]
+                actual_seg = actual_cumulative - prev_total
+
+                if use_snapshot:
+                    comp_best = best_segments.get(name)
                 else:
-                    comp_best = timer._get_best_segment(
-                        i, data.split_names, data.segment_history)
-                    comp_pb = None
-
-                if self.show_best_segment_time:
-                    time_str = self._get_comparison_time(
-                        i, data, timer, seg_decimals)
-                    segment_time_color = self.text_color
+                    comp_best = best_history[i]
+
+                if show_best_segment_time:
+                    time_str = fmt(comparison_times[i] or 0, seg_decimals)
                 else:
-                    time_str = self._format_time(
-                        actual_seg, decimal_places=seg_decimals)
-
-                if self.show_deltas:
-                    # Calculate cumulative comparison time for delta
-                    if self.comparison_type == "sob":
-                        # Sum of best segments up to this point
-                        comp_cumulative_times = [
-                            timer.comparison_best_segments.get(
-                                data.split_names[j])
-                            for j in range(i + 1)
-                        ]
-                        comp_cumulative_times = [t for t in
-                                                 comp_cumulative_times if
-                                                 t is not None]
-                        comp_cumulative = (sum(comp_cumulative_times) if
-                                           comp_cumulative_times else None)
-                    else:
-                        # PB segments up to this point
-                        comp_cumulative_times = [
-                            timer.comparison_pb_segments.get(
-                                data.split_names[j])
-                            for j in range(i + 1)
-                        ]
-                        comp_cumulative_times = [t for t in
-                                                 comp_cumulative_times if
-                                                 t is not None]
-                        comp_cumulative = (sum(comp_cumulative_times) if
-                                           comp_cumulative_times else None)
+                    time_str = fmt(actual_seg, seg_decimals)
+
+                if show_deltas:
+                    # Cumulative comparison time up to this point
+                    comp_cumulative = comp_cumulative_list[i]
 
                     if comp_cumulative is not None:
-                        if self.delta_type == "segment" and comp_best is not None:
+                        if segment_delta and comp_best is not None:
                             # Segment delta
                             delta = actual_seg - comp_best
                         else:
                             # Cumulative delta
                             delta = actual_cumulative - comp_cumulative
-                        delta_str = self._format_time(
-                            delta, show_plus=True, decimal_places=1,
-                            strip_leading_zero=True, delta_format=True)
+                        delta_str = fmt_delta(delta)
 
                         # Check if this segment was gold
                         segment_was_gold = (comp_best is not None and
                                             actual_seg <= comp_best + 0.001)
 
-                        if segment_was_gold and self.delta_type == "segment":
-                            delta_time_color = self.gold_color
+                        if segment_was_gold and segment_delta:
+                            delta_time_color = gold_color
                         else:
                             # Green if ahead, red if behind
-                            delta_time_color = (self.green_color if delta < 0
-                                                else self.red_color)
-            elif i == timer.current_split_index:
-                best_seg = timer._get_best_segment(
-                    i, data.split_names, data.segment_history)
+                            delta_time_color = (green_color if delta < 0
+                                                else red_color)
+            elif i == current_index:
+                best_seg = best_history[i]
 
                 # Live Delta Implementation
-                if timer.timer_running and self.show_deltas:
+                if timer_running and show_deltas:
                     live_seg_duration = current_total_elapsed - prev_total
 
-                    if self.delta_type == "segment" and best_seg is not None:
+                    if segment_delta and best_seg is not None:
                         # Segment delta
                         live_delta = live_seg_duration - best_seg
                     else:
                         # Cumulative delta
-                        # Calculate cumulative comparison time up to current split
-                        comp_cumulative_times = []
-                        for j in range(i + 1):
-                            if self.comparison_type == "sob":
-                                comp_time = timer.comparison_best_segments.get(
-                                    data.split_names[j])
-                            else:
-                                comp_time = timer.comparison_pb_segments.get(
-                                    data.split_names[j])
-                            if comp_time is not None:
-                                comp_cumulative_times.append(comp_time)
-                        comp_cumulative = (sum(comp_cumulative_times) if
-                                          comp_cumulative_times else None)
+                        comp_cumulative = comp_cumulative_list[i]
 
                         if comp_cumulative is not None:
                             live_delta = current_total_elapsed - comp_cumulative
@@ -641,165 +1087,104 @@ class SVGRenderer:
                             live_delta = None
 
                     if live_delta is not None and live_delta > -10.0:
-                        delta_str = self._format_time(
-                            live_delta, show_plus=True, decimal_places=1,
-                            strip_leading_zero=True, delta_format=True)
+                        delta_str = fmt_delta(live_delta)
                         # Green if ahead, red if behind
-                        delta_time_color = (self.green_color if
-                                            live_delta < 0 else
-                                            self.red_color)
-
-                if self.show_best_segment_time:
-                    time_str = self._get_comparison_time(
-                        i, data, timer, seg_decimals)
-                    segment_time_color = self.text_color
+                        delta_time_color = (green_color if live_delta < 0
+                                            else red_color)
+
+                if show_best_segment_time:
+                    time_str = fmt(comparison_times[i] or 0, seg_decimals)
                 else:
-                    segment_time_color = self.text_color
-                    time_str = self._format_time(
-                        current_total_elapsed - prev_total,
-                        decimal_places=seg_decimals)
+                    time_str = fmt(current_total_elapsed - prev_total,
+                                   seg_decimals)
+            elif show_best_segment_time:
+                time_str = fmt(comparison_times[i] or 0, seg_decimals)
             else:
-                if self.show_best_segment_time:
-                    time_str = self._get_comparison_time(
-                        i, data, timer, seg_decimals)
-                    segment_time_color = self.text_color
-                else:
-                    # Show 00:00.xx for normal mode when no data
-                    time_str = "00:00.00" if seg_decimals == 2 else "00:00"
-
-            svg.append(
-                f'<text x="15" y="{y_offset}" '
-                f'fill="{self.text_color}" '
-                f'font-family="{self.normal_font}" '
-                f'font-size="{16 * self.font_scale}">{name}</text>')
-            if delta_str:
-                svg.append(
-                    f'<text x="310" y="{y_offset}" '
-                    f'fill="{delta_time_color}" '
-                    f'font-family="{self.mono_font}" '
-                    f'font-size="{13 * self.font_scale}" '
-                    f'text-anchor="end" opacity="0.9">{delta_str}</text>')
-            svg.append(
-                f'<text x="385" y="{y_offset}" '
-                f'fill="{segment_time_color}" '
-                f'font-family="{self.mono_font}" '
-                f'font-size="{16 * self.font_scale}" text-anchor="end">'
-                f'{time_str}</text>')
-            y_offset += self.line_spacing
+                # Show 00:00.xx for normal mode when no data
+                time_str = empty_time
 
-        pb_str = (self._format_time(pb_total) if pb_total is not None
-                  and pb_total > 0 else "00:00.00")
-        sob_str = (self._format_time(sob_total) if sob_total > 0
-                   else "00:00.00")
+            append((row_delta_tmpl if delta_str else row_tmpl).format_map({
+                "delta": delta_str,
+                "delta_color": delta_time_color,
+                "time": time_str,
+            }))
+
+        pb_str = (self._format_clock(pb_total) if pb_total is not None
+                  and pb_total > 0 else self._ZERO_TIMES[2])
+        sob_str = (self._format_clock(sob_total) if sob_total > 0
+                   else self._ZERO_TIMES[2])
 
         # Footer
         footer_y = content_start_y + render_height
-        svg.append(
-            f'<text x="20" y="{footer_y - 45}" '
-            f'fill="{self.text_color}" '
-            f'font-family="{self.normal_font}" '
-            f'font-size="{12 * self.font_scale}" opacity="0.7">PB: '
-            f'<tspan font-family="{self.mono_font}">{pb_str}</tspan>'
-            f'</text>')
-        svg.append(
-            f'<text x="20" y="{footer_y - 25}" '
-            f'fill="{self.text_color}" '
-            f'font-family="{self.normal_font}" '
-            f'font-size="{12 * self.font_scale}" opacity="0.7">SoB: '
-            f'<tspan font-family="{self.mono_font}">{sob_str}</tspan>'
-            f'</text>')
-
-        svg.append(
-            f'<text x="380" y="{footer_y - 30}" '
-            f'fill="{final_timer_color}" '
-            f'font-family="{self.mono_font}" '
-            f'font-size="{48 * self.font_scale}" font-weight="bold" '
-            f'text-anchor="end">'
-            f'{self._format_time(current_total_elapsed)}</text>')
-
-        svg.append('</svg>')
-        return "".join(svg)
-
-    def _get_comparison_time(self, index, data, timer, seg_decimals):
-        """Get comparison time based on current mode."""
+        append(self._footer_tmpl.format_map({
+            "pb_y": footer_y - 45,
+            "pb": pb_str,
+            "sob_y": footer_y - 25,
+            "sob": sob_str,
+            "timer_y": footer_y - 30,
+            "timer": self._format_clock(current_total_elapsed),
+            "timer_color": final_timer_color,
+        }))
+
+        append('</svg>')
+        self._cache_key = cache_key
+        self._cache_svg = "".join(svg)
+        return self._cache_svg
+
+    def _get_rows(self, split_names, y_offset):
+        """Per-split row templates with name and position filled in.
+
+        Returns (row template, row-with-delta template, active segment
+        highlight) for each split, rebuilt only when the splits, their
+        position or the settings change.
+        """
+        key = (split_names, y_offset, self._settings_key)
+        if key == self._rows_key:
+            return self._rows
+        # Leave the per-frame fields as placeholders
+        fields = {"delta": "{delta}", "delta_color": "{delta_color}",
+                  "time": "{time}"}
+        rows = []
+        for name in split_names:
+            fields["y"] = y_offset
+            fields["name"] = name.replace("{", "{{").replace("}", "}}")
+            rows.append((
+                self._row_tmpl.format_map(fields),
+                self._row_delta_tmpl.format_map(fields),
+                self._active_tmpl.format_map({
+                    "y": (y_offset - self._row_center_offset -
+                          self.line_spacing / 2)}),
+            ))
+            y_offset += self.line_spacing
+        self._rows_key = key
+        self._rows = rows
+        return rows
+
+    def _get_comparison_times(self, data, state):
+        """Get cumulative comparison times for every split."""
         if self.comparison_type == "sob":
-            best_times = [
-                timer._get_best_segment(j, data.split_names,
-                                        data.segment_history)
-                for j in range(index + 1)
-            ]
-            best_times = [t for t in best_times if t is not None]
-            if not best_times:
-                if seg_decimals == 2:
-                    return "00:00.00"
-                elif seg_decimals == 0:
-                    return "00:00"
-                else:
-                    return "00:00.0"
-            cumulative_best = sum(best_times)
-            return self._format_time(cumulative_best,
-                                     decimal_places=seg_decimals)
-        else:
-            # Show cumulative PB
+            return data.best_cumulative
+
+        # Show cumulative PB
+        if not state.timer_running and state.current_split_index < 0:
             # Before run starts, use current history
-            if not timer.timer_running and timer.current_split_index < 0:
-                # Calculate from current segment_history
-                pb_run = None
-                min_total = None
-                for run_data in data.segment_history.values():
-                    run_total = sum(run_data.values())
-                    if min_total is None or run_total < min_total:
-                        min_total = run_total
-                        pb_run = run_data
-
-                if pb_run:
-                    pb_times = [pb_run.get(data.split_names[j])
-                                for j in range(index + 1)]
-                    pb_times = [t for t in pb_times if t is not None]
-                    if pb_times:
-                        cumulative_pb = sum(pb_times)
-                        return self._format_time(
-                            cumulative_pb,
-                            decimal_places=seg_decimals)
-            elif timer.comparison_pb_segments:
-                # During/after run, use snapshot
-                pb_times = [
-                    timer.comparison_pb_segments.get(data.split_names[j])
-                    for j in range(index + 1)
-                ]
-                pb_times = [t for t in pb_times if t is not None]
-                if pb_times:
-                    cumulative_pb = sum(pb_times)
-                    return self._format_time(cumulative_pb,
-                                             decimal_places=seg_decimals)
-
-            if seg_decimals == 2:
-                return "00:00.00"
-            elif seg_decimals == 0:
-                return "00:00"
-            else:
-                return "00:00.0"
+            return data.pb_cumulative
+        # During/after run, use snapshot
+        return state.comparison.get_cumulative(data.split_names)
 
+    # Finished splits, PB and SoB repeat the same values every frame
     @staticmethod
+    @functools.lru_cache(maxsize=512)
     def _format_time(seconds, show_plus=False, decimal_places=2,
                      strip_leading_zero=False, delta_format=False):
         """Format seconds into MM:SS.h or HH:MM:SS.h."""
         if seconds == 0 and not show_plus:
-            if decimal_places == 1:
-                return "00:00.0"
-            elif decimal_places == 0:
-                return "00:00"
-            else:
-                return "00:00.00"
+            return SVGRenderer._ZERO_TIMES[decimal_places]
 
         prefix = ""
         if show_plus:
-            if seconds > 0.001:
-                prefix = "+"
-            elif seconds < -0.001:
-                prefix = "-"
-            else:
-                prefix = "-"
+            # Zero and near-zero deltas are shown as "-"
+            prefix = "+" if seconds > 0.001 else "-"
             seconds = abs(seconds)
         elif seconds < 0:
             prefix = "-"
@@ -812,44 +1197,85 @@ class SVGRenderer:
         if decimal_places == 1:
             sec_str = f"{secs:04.1f}"
         elif decimal_places == 0:
-            sec_str = f"{int(secs):02d}"
+            sec_str = _TWO_DIGIT[int(secs)]
         else:
             sec_str = f"{secs:05.2f}"
 
         if hrs > 0:
-            time_str = f"{hrs:02}:{mins:02}:{sec_str}"
+            hrs_str = _TWO_DIGIT[hrs] if hrs < 100 else str(hrs)
+            time_str = f"{hrs_str}:{_TWO_DIGIT[mins]}:{sec_str}"
         elif delta_format and mins < 1:
             time_str = sec_str
         else:
-            time_str = f"{mins:02}:{sec_str}"
+            time_str = f"{_TWO_DIGIT[mins]}:{sec_str}"
 
-        if strip_leading_zero:
+        # Only a single leading zero is ever stripped
+        if strip_leading_zero and time_str[0] == "0":
             if delta_format:
                 # For delta format, strip leading zeros from minutes
                 if mins > 0 and hrs == 0:
-                    time_str = re.sub(r'^0', '', time_str)
+                    time_str = time_str[1:]
                 # Also strip leading zero from seconds if no minutes
                 elif mins == 0:
-                    time_str = re.sub(r'^0', '', time_str)
-            elif not delta_format:
-                time_str = re.sub(r'^0', '', time_str)
+                    time_str = time_str[1:]
+            else:
+                time_str = time_str[1:]
 
         return f"{prefix}{time_str}"
 
+    @classmethod
+    @functools.lru_cache(maxsize=512)
+    def _format_clock(cls, seconds, decimal_places=2):
+        """Format an unsigned time as MM:SS.hh, like _format_time().
+
+        Times under an hour, which is nearly every time shown, skip the
+        general path.
+        """
+        if not 0 < seconds < 3600:
+            return cls._format_time(seconds, decimal_places=decimal_places)
+        secs = seconds % 60
+        if decimal_places == 2:
+            sec_str = f"{secs:05.2f}"
+        elif decimal_places == 0:
+            sec_str = _TWO_DIGIT[int(secs)]
+        else:
+            sec_str = f"{secs:04.1f}"
+        return f"{_TWO_DIGIT[int(seconds // 60)]}:{sec_str}"
+
+    @classmethod
+    @functools.lru_cache(maxsize=512)
+    def _format_delta(cls, seconds):
+        """Format a signed delta, e.g. "+1.2" or "-1:05.3".
+
+        Same output as _format_time() with show_plus, one decimal place,
+        strip_leading_zero and delta_format, but deltas under a minute
+        (nearly all of them) skip the general path.
+        """
+        magnitude = abs(seconds)
+        if magnitude >= 60:
+            return cls._format_time(seconds, show_plus=True,
+                                    decimal_places=1,
+                                    strip_leading_zero=True,
+                                    delta_format=True)
+        sec_str = f"{magnitude:04.1f}"
+        if sec_str[0] == "0":
+            sec_str = sec_str[1:]
+        return ("+" if seconds > 0.001 else "-") + sec_str
+
     @staticmethod
-    def _get_image_data_uri(path):
-        """Convert local image to base64 data URI for SVG embedding."""
-        if not path or not os.path.exists(path):
+    def _get_image_token(path):
+        """(mtime_ns, size) of the game image, or None if there is none.
+
+        Together with the path this keys the encoded image in
+        _encode_image(), so an edited image is embedded again.
+        """
+        if not path:
             return None
         try:
-            ext = os.path.splitext(path)[1].lower().strip(".")
-            mime = f"image/{ext}" if ext != "jpg" else "image/jpeg"
-            with open(path, "rb") as img_file:
-                b64_string = base64.b64encode(
-                    img_file.read()).decode("utf-8")
-            return f"data:{mime};base64,{b64_string}"
-        except Exception:
+            st = os.stat(path)
+        except OSError:
             return None
+        return st.st_mtime_ns, st.st_size
 
 
 class SplitsPlugin:
@@ -864,12 +1290,36 @@ class SplitsPlugin:
         self.socket_server = None
         self.socket_enabled = False
         self.socket_path = "/tmp/obs_splits.sock"
+        # (source name, SVG) last pushed to OBS
+        self._last_update = None
+        self._last_render = 0.0
+        # Names of image sources, or None once a source has been created,
+        # removed or renamed
+        self._image_source_names = None
+        # Bound once: OBS matches callbacks by identity on disconnect
+        self._sources_changed_cb = self._on_sources_changed
+        # obs_data pointing the image source at SVG_PATH, made on first use
+        self._svg_settings = None
+        # Referenced image source and the name it was looked up by; the
+        # signal handlers mark it stale when sources are removed or renamed
+        self._source = None
+        self._source_lookup_name = None
+        self._source_stale = False
+        # Frames are rendered and written on their own thread so a slow
+        # render or write never stalls OBS's graphics thread, which runs
+        # script_tick. Held while rendering or applying settings.
+        self.render_lock = threading.Lock()
+        self._render_event = threading.Event()
+        self._render_stop = False
+        self._render_thread = None
+        self._next_monitor_check = 0.0
 
     def _on_split(self):
         """Handle split input."""
         if not self.timer.timer_running and self.timer.current_split_index == -1:
-            self.timer.start(self.data.split_names,
-                             self.data.segment_history)
+            data = self.data
+            self.timer.start(data.split_names, data.best_by_name,
+                             data.pb_run, data.pb_total)
         elif self.timer.timer_running:
             is_finished = self.timer.split(self.data.split_names)
             if is_finished:
@@ -956,7 +1406,9 @@ class SplitsPlugin:
                 return {"response": "error", "error": "no_splits_loaded", "message": "No splits data loaded"}
 
             # Start the run
-            self.timer.start(self.data.split_names, self.data.segment_history)
+            data = self.data
+            self.timer.start(data.split_names, data.best_by_name,
+                             data.pb_run, data.pb_total)
 
             return {
                 "response": "run_started",
@@ -1003,25 +1455,166 @@ class SplitsPlugin:
             self.socket_enabled = False
             self._log("Socket interface disabled")
 
+    def get_image_source_names(self):
+        """Names of all image sources, enumerated again only if stale."""
+        names = self._image_source_names
+        if names is None:
+            names = []
+            sources = obs.obs_enum_sources()
+            for s in sources or ():
+                if obs.obs_source_get_unversioned_id(s) == "image_source":
+                    names.append(obs.obs_source_get_name(s))
+            obs.source_list_release(sources)
+            self._image_source_names = names
+        return names
+
+    def watch_sources(self, connect=True):
+        """(Dis)connect the signals that make the source name list stale."""
+        handler = obs.obs_get_signal_handler()
+        update = (obs.signal_handler_connect if connect else
+                  obs.signal_handler_disconnect)
+        for signal in ("source_create", "source_destroy", "source_remove",
+                       "source_rename"):
+            update(handler, signal, self._sources_changed_cb)
+
+    def _on_sources_changed(self, calldata):
+        """Drop the cached source names; may run on any thread."""
+        self._image_source_names = None
+        self._source_stale = True
+        # A new or recreated source has not been shown anything yet
+        self._last_update = None
+
+    def _get_source(self):
+        """The source named source_name, looked up again only when stale."""
+        if self._source_stale or self._source_lookup_name != self.source_name:
+            self._source_stale = False
+            self.release_source()
+            self._source = obs.obs_get_source_by_name(self.source_name)
+            if self._source is not None:
+                self._source_lookup_name = self.source_name
+        return self._source
+
+    def release_source(self):
+        """Drop the reference held on the image source."""
+        if self._source is not None:
+            obs.obs_source_release(self._source)
+            self._source = None
+        self._source_lookup_name = None
+        # Whatever source is looked up next gets at least one push
+        self._last_update = None
+
     def update_source(self):
         """Update the OBS source with new SVG content."""
+        # Let go of a source that was removed, renamed or deselected even
+        # on frames that never get as far as looking it up
+        if self._source is not None and (
+                self._source_stale or
+                self._source_lookup_name != self.source_name):
+            self.release_source()
         if not self.source_name:
             return
 
-        source = obs.obs_get_source_by_name(self.source_name)
-        if source is not None:
+        if self.timer.timer_running:
+            now = time.monotonic()
+            if now - self._last_render < RENDER_INTERVAL:
+                return
+            self._last_render = now
+            svg_content = None
+        else:
+            now = None
+            # A stopped timer renders from the cache; if that SVG is the
+            # one already shown, skip even the source lookup, unless the
+            # sources changed and it has to be looked up again
             svg_content = self.renderer.render(self.data, self.timer)
-            svg_path = "/tmp/obs_splits.svg"
+            if (not self._source_stale and
+                    (self.source_name, svg_content) == self._last_update):
+                return
+
+        source = self._get_source()
+        if source is None:
+            return
+        # Hidden sources are still ticked; render once they are shown again
+        if not obs.obs_source_showing(source):
+            return
+        if svg_content is None:
+            svg_content = self.renderer.render(self.data, self.timer, now)
+        update = (self.source_name, svg_content)
+        if update == self._last_update:
+            # Unchanged; don't make OBS reload an identical image
+            return
+        svg_path = SVG_PATH
+        tmp_path = svg_path + ".tmp"
+        try:
+            # Write beside the target and rename over it, so OBS never
+            # loads a half-written file
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+                         0o644)
             try:
-                with open(svg_path, 'w') as f:
-                    f.write(svg_content)
-                settings = obs.obs_data_create()
-                obs.obs_data_set_string(settings, "file", svg_path)
-                obs.obs_source_update(source, settings)
-                obs.obs_data_release(settings)
-            except Exception as e:
-                self._log(f"Error updating SVG: {e}")
-            obs.obs_source_release(source)
+                os.write(fd, svg_content.encode('utf-8'))
+            finally:
+                os.close(fd)
+            os.replace(tmp_path, svg_path)
+            if self._svg_settings is None:
+                self._svg_settings = obs.obs_data_create()
+                obs.obs_data_set_string(self._svg_settings, "file",
+                                        svg_path)
+            obs.obs_source_update(source, self._svg_settings)
+            self._last_update = update
+        except Exception as e:
+            self._log(f"Error updating SVG: {e}")
+
+    def start_render_thread(self):
+        """Start the thread that renders requested frames."""
+        if self._render_thread is None or not self._render_thread.is_alive():
+            self._render_stop = False
+            self._render_thread = threading.Thread(target=self._render_loop,
+                                                   daemon=True)
+            self._render_thread.start()
+
+    def stop_render_thread(self):
+        """Stop the render thread, waiting for a frame in progress."""
+        self._render_stop = True
+        self._render_event.set()
+        if self._render_thread is not None:
+            self._render_thread.join(timeout=2.0)
+            self._render_thread = None
+
+    def check_input_monitor(self):
+        """Restart the input thread if it died, at most once a second."""
+        now = time.monotonic()
+        if now < self._next_monitor_check:
+            return
+        self._next_monitor_check = now + MONITOR_CHECK_INTERVAL
+        self.input_monitor.start()
+
+    def request_update(self):
+        """Ask the render thread for a frame; cheap enough for every tick."""
+        self._render_event.set()
+
+    def _render_loop(self):
+        """Render a frame and flush history each time one is requested."""
+        event = self._render_event
+        while True:
+            event.wait()
+            event.clear()
+            if self._render_stop:
+                break
+            with self.render_lock:
+                # A failed frame must not end the thread; the next tick
+                # tries again
+                try:
+                    self.update_source()
+                except Exception as e:
+                    self._log(f"Error rendering splits: {e}")
+                # Pending history is written here too, so a completed run
+                # never stalls the graphics thread on file I/O
+                self.data.flush_history()
+
+    def release_svg_settings(self):
+        """Release the reused image source settings."""
+        if self._svg_settings is not None:
+            obs.obs_data_release(self._svg_settings)
+            self._svg_settings = None
 
     @staticmethod
     def _log(message):
@@ -1035,28 +1628,62 @@ class SplitsPlugin:
 plugin = SplitsPlugin()
 
 
-@staticmethod
+# Colour settings, each stored on SVGRenderer under the same name
+COLOR_SETTINGS = ("bg_color", "text_color", "highlight_color", "gold_color",
+                  "green_color", "red_color", "active_segment_bg",
+                  "separator_color")
+
+
+@functools.lru_cache(maxsize=64)
 def int_to_hex_color(color_int):
     """Convert OBS int color (BGR) to hex color string (#RRGGBB)."""
-    hex_color = "#{:06x}".format(color_int & 0xFFFFFF)
-    return "#" + hex_color[5:7] + hex_color[3:5] + hex_color[1:3]
+    return (f"#{color_int & 0xFF:02x}{(color_int >> 8) & 0xFF:02x}"
+            f"{(color_int >> 16) & 0xFF:02x}")
+
+
+# Setting defaults, grouped by the obs_data_set_default_* setter they need
+_INT_DEFAULTS = (
+    ("input_code", 316),
+    ("height_setting", 800),
+    ("bg_opacity", 80),
+    ("corner_radius", 10),
+    ("line_spacing", 40),
+    ("bg_color", 2498332),
+    ("text_color", 15326936),
+    ("highlight_color", 12689793),
+    ("gold_color", 9161707),
+    ("green_color", 9223843),
+    ("red_color", 6971839),
+    ("active_segment_bg", 6179907),
+    ("separator_color", 6968908),
+)
+_BOOL_DEFAULTS = (
+    ("enable_socket_interface", False),
+    ("show_ms", True),
+    ("show_best_segment_time", True),
+    ("show_deltas", True),
+    ("use_dynamic_height", True),
+)
+_STRING_DEFAULTS = (
+    ("device_blacklist", "ydotool"),
+    ("socket_path", "/tmp/obs_splits.sock"),
+    ("comparison_type", "pb"),
+    ("delta_type", "cumulative"),
+)
+_DOUBLE_DEFAULTS = (
+    ("font_scale", 1.0),
+)
 
 
 def script_defaults(settings):
-    obs.obs_data_set_default_int(settings, "input_code", 316)
-    obs.obs_data_set_default_string(settings, "device_blacklist", "ydotool")
-    obs.obs_data_set_default_bool(settings, "enable_socket_interface", False)
-    obs.obs_data_set_default_string(settings, "socket_path", "/tmp/obs_splits.sock")
-    obs.obs_data_set_default_bool(settings, "show_ms", True)
-    obs.obs_data_set_default_bool(settings, "show_best_segment_time",
-                                  True)
-    obs.obs_data_set_default_bool(settings, "show_deltas", True)
-    obs.obs_data_set_default_string(settings, "comparison_type", "pb")
-    obs.obs_data_set_default_string(settings, "delta_type", "cumulative")
-    obs.obs_data_set_default_bool(settings, "use_dynamic_height", True)
-    obs.obs_data_set_default_int(settings, "height_setting", 800)
-    obs.obs_data_set_default_int(settings, "bg_opacity", 80)
-    obs.obs_data_set_default_int(settings, "corner_radius", 10)
+    for name, value in _INT_DEFAULTS:
+        obs.obs_data_set_default_int(settings, name, value)
+    for name, value in _BOOL_DEFAULTS:
+        obs.obs_data_set_default_bool(settings, name, value)
+    for name, value in _STRING_DEFAULTS:
+        obs.obs_data_set_default_string(settings, name, value)
+    for name, value in _DOUBLE_DEFAULTS:
+        obs.obs_data_set_default_double(settings, name, value)
 
     # Set default fonts
     # normal_font_data = obs.obs_data_create()
@@ -1069,17 +1696,6 @@ def script_defaults(settings):
     # obs.obs_data_set_default_obj(settings, "mono_font_select", mono_font_data)
     # obs.obs_data_release(mono_font_data)
 
-    obs.obs_data_set_default_double(settings, "font_scale", 1.0)
-    obs.obs_data_set_default_int(settings, "line_spacing", 40)
-    obs.obs_data_set_default_int(settings, "bg_color", 2498332)
-    obs.obs_data_set_default_int(settings, "text_color", 15326936)
-    obs.obs_data_set_default_int(settings, "highlight_color", 12689793)
-    obs.obs_data_set_default_int(settings, "gold_color", 9161707)
-    obs.obs_data_set_default_int(settings, "green_color", 9223843)
-    obs.obs_data_set_default_int(settings, "red_color", 6971839)
-    obs.obs_data_set_default_int(settings, "active_segment_bg", 6179907)
-    obs.obs_data_set_default_int(settings, "separator_color", 6968908)
-
 
 def script_description():
     return ("SVG Speedrun Splits Display.\nPress KEY_RECORD to split, "
@@ -1176,7 +1792,7 @@ def script_properties():
     if data:
         for g in data.keys():
             obs.obs_property_list_add_string(g_list, g, g)
-        current_g = list(data.keys())[0]
+        current_g = next(iter(data))
         categories = data[current_g].get("categories", {})
         for c in categories.keys():
             obs.obs_property_list_add_string(c_list, c, c)
@@ -1184,41 +1800,48 @@ def script_properties():
     p = obs.obs_properties_add_list(
         props, "source", "Image Source", obs.OBS_COMBO_TYPE_EDITABLE,
         obs.OBS_COMBO_FORMAT_STRING)
-    sources = obs.obs_enum_sources()
-    if sources:
-        for s in sources:
-            if obs.obs_source_get_unversioned_id(s) == "image_source":
-                name = obs.obs_source_get_name(s)
-                obs.obs_property_list_add_string(p, name, name)
-        obs.source_list_release(sources)
+    for name in plugin.get_image_source_names():
+        obs.obs_property_list_add_string(p, name, name)
     return props
 
 
 def script_update(settings):
-    plugin.source_name = obs.obs_data_get_string(settings, "source")
-    splits_file_path = obs.obs_data_get_string(settings, "splits_file")
-    plugin.data.game_name = obs.obs_data_get_string(settings,
-                                                    "game_select")
-    plugin.data.category_name = obs.obs_data_get_string(settings,
-                                                        "category_select")
-    plugin.renderer.show_ms = obs.obs_data_get_bool(settings, "show_ms")
-    plugin.renderer.show_best_segment_time = obs.obs_data_get_bool(
-        settings, "show_best_segment_time")
-    plugin.renderer.show_deltas = obs.obs_data_get_bool(settings, "show_deltas")
-    plugin.renderer.comparison_type = obs.obs_data_get_string(
-        settings, "comparison_type")
-    plugin.renderer.delta_type = obs.obs_data_get_string(
-        settings, "delta_type")
-    plugin.input_monitor.device_blacklist = obs.obs_data_get_string(
-        settings, "device_blacklist")
-    plugin.input_monitor.device_filter = obs.obs_data_get_string(
-        settings, "device_filter")
-    plugin.input_monitor.input_code = obs.obs_data_get_int(settings,
-                                                           "input_code")
+    # Don't change settings under a frame being rendered
+    with plugin.render_lock:
+        _apply_settings(settings)
+
+
+def _apply_settings(settings):
+    renderer = plugin.renderer
+    monitor = plugin.input_monitor
+    data = plugin.data
+    get_string = obs.obs_data_get_string
+    get_int = obs.obs_data_get_int
+    get_bool = obs.obs_data_get_bool
+
+    plugin.source_name = get_string(settings, "source")
+    splits_file_path = get_string(settings, "splits_file")
+    data.game_name = get_string(settings, "game_select")
+    data.category_name = get_string(settings, "category_select")
+    renderer.show_ms = get_bool(settings, "show_ms")
+    renderer.show_best_segment_time = get_bool(settings,
+                                               "show_best_segment_time")
+    renderer.show_deltas = get_bool(settings, "show_deltas")
+    renderer.comparison_type = get_string(settings, "comparison_type")
+    renderer.delta_type = get_string(settings, "delta_type")
+    device_settings = (get_string(settings, "device_blacklist"),
+                       get_string(settings, "device_filter"),
+                       get_int(settings, "input_code"))
+    # Earlier device verdicts only go stale when these change
+    if device_settings != (monitor.device_blacklist, monitor.device_filter,
+                           monitor.input_code):
+        (monitor.device_blacklist, monitor.device_filter,
+         monitor.input_code) = device_settings
+        monitor.clear_probe_cache()
 
     # Handle socket interface
-    socket_enabled = obs.obs_data_get_bool(settings, "enable_socket_interface")
-    socket_path = obs.obs_data_get_string(settings, "socket_path")
+    socket_enabled = get_bool(settings, "enable_socket_interface")
+    socket_path = get_string(settings, "socket_path")
 
     # Update socket path if changed
     if socket_path != plugin.socket_path:
@@ -1234,64 +1857,51 @@ def script_update(settings):
     # Update font families
     n_font_data = obs.obs_data_get_obj(settings, "normal_font_select")
     if n_font_data:
-        plugin.renderer.normal_font = obs.obs_data_get_string(n_font_data,
-                                                              "face")
+        renderer.normal_font = get_string(n_font_data, "face")
         obs.obs_data_release(n_font_data)
 
     m_font_data = obs.obs_data_get_obj(settings, "mono_font_select")
     if m_font_data:
-        plugin.renderer.mono_font = obs.obs_data_get_string(m_font_data,
-                                                            "face")
+        renderer.mono_font = get_string(m_font_data, "face")
         obs.obs_data_release(m_font_data)
 
-    plugin.renderer.use_dynamic_height = obs.obs_data_get_bool(
-        settings, "use_dynamic_height")
-    plugin.renderer.height_setting = obs.obs_data_get_int(settings,
-                                                          "height_setting")
-
-    plugin.renderer.font_scale = obs.obs_data_get_double(settings,
-                                                         "font_scale")
-    if plugin.renderer.font_scale <= 0:
-        plugin.renderer.font_scale = 1.0
-
-    plugin.renderer.line_spacing = obs.obs_data_get_int(settings,
-                                                        "line_spacing")
-    if plugin.renderer.line_spacing <= 0:
-        plugin.renderer.line_spacing = 30
-
-    bg_color_int = obs.obs_data_get_int(settings, "bg_color")
-    plugin.renderer.bg_color = int_to_hex_color(bg_color_int)
-
-    plugin.renderer.text_color = int_to_hex_color(
-        obs.obs_data_get_int(settings, "text_color"))
-    plugin.renderer.highlight_color = int_to_hex_color(
-        obs.obs_data_get_int(settings, "highlight_color"))
-    plugin.renderer.gold_color = int_to_hex_color(
-        obs.obs_data_get_int(settings, "gold_color"))
-    plugin.renderer.green_color = int_to_hex_color(
-        obs.obs_data_get_int(settings, "green_color"))
-    plugin.renderer.red_color = int_to_hex_color(
-        obs.obs_data_get_int(settings, "red_color"))
-    plugin.renderer.active_segment_bg = int_to_hex_color(
-        obs.obs_data_get_int(settings, "active_segment_bg"))
-    plugin.renderer.separator_color = int_to_hex_color(
-        obs.obs_data_get_int(settings, "separator_color"))
-
-    plugin.renderer.bg_opacity = obs.obs_data_get_int(settings,
-                                                      "bg_opacity")
-    plugin.renderer.corner_radius = obs.obs_data_get_int(settings,
-                                                         "corner_radius")
-
-    plugin.data.load_splits(splits_file_path)
-    plugin.input_monitor.start()
+    renderer.use_dynamic_height = get_bool(settings, "use_dynamic_height")
+    renderer.height_setting = get_int(settings, "height_setting")
+
+    renderer.font_scale = obs.obs_data_get_double(settings, "font_scale")
+    if renderer.font_scale <= 0:
+        renderer.font_scale = 1.0
+
+    renderer.line_spacing = get_int(settings, "line_spacing")
+    if renderer.line_spacing <= 0:
+        renderer.line_spacing = 30
+
+    for name in COLOR_SETTINGS:
+        setattr(renderer, name, int_to_hex_color(get_int(settings, name)))
+
+    renderer.bg_opacity = get_int(settings, "bg_opacity")
+    renderer.corner_radius = get_int(settings, "corner_radius")
+    renderer.update_settings()
+
+    data.load_splits(splits_file_path)
+    monitor.start()
+
+
+def script_load(settings):
+    plugin.watch_sources()
+    plugin.start_render_thread()
 
 
 def script_tick(seconds):
-    if plugin.source_name:
-        plugin.update_source()
-    plugin.input_monitor.start()
+    plugin.request_update()
+    plugin.check_input_monitor()
 
 
 def script_unload():
-    plugin.input_monitor.stop()
+    plugin.watch_sources(connect=False)
+    plugin.input_monitor.close()
     plugin.disable_socket_interface()
+    plugin.stop_render_thread()
+    plugin.data.flush_history(force=True)
+    plugin.release_source()
+    plugin.release_svg_settings()